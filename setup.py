@@ -19,6 +19,7 @@ setup(
         "synapseclient>=4.0.0,<5.0.0",
         "rich>=10.0.0",
         "lxml>=4.9.0",
+        "urllib3>=1.26",
     ],
     entry_points={
         "console_scripts": [
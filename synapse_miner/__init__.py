@@ -2,7 +2,13 @@
 Synapse ID Mining package.
 """
 
-from .core import SynapseMiner
-
 __version__ = "0.1.0"
-__all__ = ["SynapseMiner"]
\ No newline at end of file
+__all__ = ["SynapseMiner"]
+
+def __getattr__(name):
+    # Import the core on first use so light entry points (e.g. the CLI's
+    # --help or combine) do not pay for rich and the XML parsing stack
+    if name == "SynapseMiner":
+        from .core import SynapseMiner
+        return SynapseMiner
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,28 +4,56 @@ Command-line interface for Synapse ID Mining.
 
 import argparse
 import logging
+import os
+import re
 import sys
-from pathlib import Path
-from typing import Optional
-
-from .core import SynapseMiner
-from synapse_miner.utils import ProcessingTracker
-
-# Import combine_results conditionally
-try:
-    from synapse_miner.utils import combine_results
-    COMBINE_AVAILABLE = True
-except ImportError:
-    combine_results = None
-    COMBINE_AVAILABLE = False
-
-# Import SynapseUploader only if available
-try:
-    from synapse_miner.utils import SynapseUploader
-    SYNAPSE_AVAILABLE = True
-except ImportError:
-    SynapseUploader = None
-    SYNAPSE_AVAILABLE = False
+
+# Heavy dependencies (rich, pandas, synapseclient) are imported inside the
+# commands that need them so --help and light commands start quickly.
+
+def _import_synapse_uploader(logger):
+    """Import SynapseUploader on demand, exiting if its dependencies are missing."""
+    try:
+        from synapse_miner.utils.synapse_integration import SynapseUploader
+    except ImportError as e:
+        logger.error(f"Synapse integration is unavailable: {e}")
+        sys.exit(1)
+    return SynapseUploader
+
+# Starting PMC number of a batch file like 'results.csv.PMC11890001_PMC11900000.xml.gz.csv'
+_BATCH_PMC_RE = re.compile(r'PMC(\d+)_PMC\d+')
+
+def _batch_sort_key(batch_file: str):
+    """Order batch files numerically by starting PMC ID (PMC9... before PMC10...)."""
+    match = _BATCH_PMC_RE.search(os.path.basename(batch_file))
+    if match:
+        return (0, int(match.group(1)), batch_file)
+    return (1, 0, batch_file)
+
+def _iter_batch_files(output_path: str):
+    """Yield batch result files named ``{output_path}.*.csv`` with one directory scan.
+    
+    Equivalent to ``glob.glob(f"{output_path}.*.csv")`` but uses a plain prefix
+    and suffix check on ``os.scandir`` entries instead of fnmatch and stat calls.
+    """
+    directory, base_name = os.path.split(output_path)
+    prefix = f"{base_name}."
+    min_length = len(prefix) + len(".csv")
+    with os.scandir(directory or ".") as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(".csv") and len(name) >= min_length:
+                yield os.path.join(directory, name)
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
 
 def setup_logging(verbose: bool = False) -> None:
     """Set up logging configuration."""
@@ -53,6 +81,11 @@ def main() -> None:
         default=100,
         help="Number of characters to include around each Synapse ID (default: 100)"
     )
+    parser.add_argument(
+        "-w", "--workers",
+        type=_positive_int,
+        help="Number of worker processes for parsing articles (default: CPUs available to this process)"
+    )
     
     # Subcommands
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
@@ -64,15 +97,17 @@ def main() -> None:
     )
     local_parser.add_argument(
         "file",
-        type=Path,
         help="Path to the XML file to process"
     )
     local_parser.add_argument(
         "-o", "--output",
-        type=Path,
         default="results.csv",
         help="Path to save results (default: results.csv)"
     )
+    local_parser.add_argument(
+        "--cache",
+        help="Path to a findings cache file; unchanged files are not re-scanned"
+    )
     
     # Process HTTP files
     http_parser = subparsers.add_parser(
@@ -98,6 +133,12 @@ def main() -> None:
         type=int,
         help="Maximum number of files to process"
     )
+    http_parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=2,
+        help="Number of files to download ahead of processing (default: 2)"
+    )
     
     # Combine command
     combine_parser = subparsers.add_parser(
@@ -120,128 +161,145 @@ def main() -> None:
     )
     
     # Automated workflow command
-    if SYNAPSE_AVAILABLE:
-        workflow_parser = subparsers.add_parser(
-            "workflow",
-            help="Run automated weekly workflow with Synapse integration"
-        )
-        workflow_parser.add_argument(
-            "-u", "--url",
-            default="https://europepmc.org/ftp/oa/",
-            help="Base URL of the Europe PMC server (default: https://europepmc.org/ftp/oa/)"
-        )
-        workflow_parser.add_argument(
-            "-o", "--output",
-            default="workflow_results.csv",
-            help="Base name for output files (default: workflow_results.csv)"
-        )
-        workflow_parser.add_argument(
-            "-t", "--tracking-file",
-            default="last_processed_pmc.json",
-            help="Path to tracking file (default: last_processed_pmc.json)"
-        )
-        workflow_parser.add_argument(
-            "--folder-id",
-            required=True,
-            help="Synapse folder ID for uploading batch files (e.g., syn66046437)"
-        )
-        workflow_parser.add_argument(
-            "--table-id", 
-            required=True,
-            help="Synapse table ID for uploading results (e.g., syn66047339)"
-        )
-        workflow_parser.add_argument(
-            "-m", "--max-files",
-            type=int,
-            help="Maximum number of files to process (for testing)"
-        )
-        workflow_parser.add_argument(
-            "--synapse-pat",
-            help="Synapse Personal Access Token (can also use SERVICE_TOKEN or SYNAPSE_PAT env var)"
-        )
+    workflow_parser = subparsers.add_parser(
+        "workflow",
+        help="Run automated weekly workflow with Synapse integration"
+    )
+    workflow_parser.add_argument(
+        "-u", "--url",
+        default="https://europepmc.org/ftp/oa/",
+        help="Base URL of the Europe PMC server (default: https://europepmc.org/ftp/oa/)"
+    )
+    workflow_parser.add_argument(
+        "-o", "--output",
+        default="workflow_results.csv",
+        help="Base name for output files (default: workflow_results.csv)"
+    )
+    workflow_parser.add_argument(
+        "-t", "--tracking-file",
+        default="last_processed_pmc.json",
+        help="Path to tracking file (default: last_processed_pmc.json)"
+    )
+    workflow_parser.add_argument(
+        "--folder-id",
+        required=True,
+        help="Synapse folder ID for uploading batch files (e.g., syn66046437)"
+    )
+    workflow_parser.add_argument(
+        "--table-id", 
+        required=True,
+        help="Synapse table ID for uploading results (e.g., syn66047339)"
+    )
+    workflow_parser.add_argument(
+        "-m", "--max-files",
+        type=int,
+        help="Maximum number of files to process (for testing)"
+    )
+    workflow_parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=2,
+        help="Number of files to download ahead of processing (default: 2)"
+    )
+    workflow_parser.add_argument(
+        "--upload-concurrency",
+        type=_positive_int,
+        default=1,
+        help="Number of batch files to upload to Synapse concurrently (default: 1)"
+    )
+    workflow_parser.add_argument(
+        "--synapse-pat",
+        help="Synapse Personal Access Token (can also use SERVICE_TOKEN or SYNAPSE_PAT env var)"
+    )
     
     # EBI Search XML generation command
-    if SYNAPSE_AVAILABLE:
-        ebisearch_parser = subparsers.add_parser(
-            "ebisearch",
-            help="Generate EBI Search XML from Synapse table"
-        )
-        ebisearch_parser.add_argument(
-            "--table-id",
-            required=True,
-            help="Synapse table ID to query for results (e.g., syn66047339)"
-        )
-        ebisearch_parser.add_argument(
-            "--output-dir",
-            default="ebisearch",
-            help="Directory to write ebisearch.xml and entity_cache.json (default: ebisearch)"
-        )
-        ebisearch_parser.add_argument(
-            "--cache-file",
-            default=None,
-            help="Path to entity metadata cache JSON (default: <output-dir>/entity_cache.json)"
-        )
-        ebisearch_parser.add_argument(
-            "--refresh",
-            action="store_true",
-            help="Re-fetch all entity metadata from Synapse, ignoring and overwriting the cache"
-        )
-        ebisearch_parser.add_argument(
-            "--db-name",
-            default="Sage Bionetworks Synapse",
-            help="Database name written to the EBI Search XML header"
-        )
-        ebisearch_parser.add_argument(
-            "--db-description",
-            default="Datasets available via Synapse, the Sage Bionetworks data sharing platform",
-            help="Database description written to the EBI Search XML header"
-        )
-        ebisearch_parser.add_argument(
-            "--synapse-pat",
-            help="Synapse Personal Access Token (can also use SYNAPSE_PAT env var)"
-        )
+    ebisearch_parser = subparsers.add_parser(
+        "ebisearch",
+        help="Generate EBI Search XML from Synapse table"
+    )
+    ebisearch_parser.add_argument(
+        "--table-id",
+        required=True,
+        help="Synapse table ID to query for results (e.g., syn66047339)"
+    )
+    ebisearch_parser.add_argument(
+        "--output-dir",
+        default="ebisearch",
+        help="Directory to write ebisearch.xml and entity_cache.json (default: ebisearch)"
+    )
+    ebisearch_parser.add_argument(
+        "--cache-file",
+        default=None,
+        help="Path to entity metadata cache JSON (default: <output-dir>/entity_cache.json)"
+    )
+    ebisearch_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-fetch all entity metadata from Synapse, ignoring and overwriting the cache"
+    )
+    ebisearch_parser.add_argument(
+        "--db-name",
+        default="Sage Bionetworks Synapse",
+        help="Database name written to the EBI Search XML header"
+    )
+    ebisearch_parser.add_argument(
+        "--db-description",
+        default="Datasets available via Synapse, the Sage Bionetworks data sharing platform",
+        help="Database description written to the EBI Search XML header"
+    )
+    ebisearch_parser.add_argument(
+        "--synapse-pat",
+        help="Synapse Personal Access Token (can also use SYNAPSE_PAT env var)"
+    )
 
     # LabLinks XML generation command
-    if SYNAPSE_AVAILABLE:
-        labslinks_parser = subparsers.add_parser(
-            "labslinks",
-            help="Generate EuropePMC LabLinks XML from Synapse table"
-        )
-        labslinks_parser.add_argument(
-            "--table-id",
-            required=True,
-            help="Synapse table ID to query for results (e.g., syn66047339)"
-        )
-        labslinks_parser.add_argument(
-            "--provider-id",
-            required=True,
-            type=int,
-            help="EuropePMC LabLinks provider ID"
-        )
-        labslinks_parser.add_argument(
-            "--output-dir",
-            default="labslinks",
-            help="Directory to write links.xml and profile.xml (default: labslinks)"
-        )
-        labslinks_parser.add_argument(
-            "--provider-name",
-            default="Sage Bionetworks",
-            help="Provider display name (default: Sage Bionetworks)"
-        )
-        labslinks_parser.add_argument(
-            "--provider-description",
-            default="Data available via Synapse, the Sage Bionetworks data sharing platform",
-            help="Provider description shown alongside links"
-        )
-        labslinks_parser.add_argument(
-            "--provider-email",
-            default="act@sagebase.org",
-            help="Provider contact email (default: act@sagebase.org)"
-        )
-        labslinks_parser.add_argument(
-            "--synapse-pat",
-            help="Synapse Personal Access Token (can also use SERVICE_TOKEN or SYNAPSE_PAT env var)"
-        )
+    labslinks_parser = subparsers.add_parser(
+        "labslinks",
+        help="Generate EuropePMC LabLinks XML from Synapse table"
+    )
+    labslinks_parser.add_argument(
+        "--table-id",
+        required=True,
+        help="Synapse table ID to query for results (e.g., syn66047339)"
+    )
+    labslinks_parser.add_argument(
+        "--provider-id",
+        required=True,
+        type=int,
+        help="EuropePMC LabLinks provider ID"
+    )
+    labslinks_parser.add_argument(
+        "--output-dir",
+        default="labslinks",
+        help="Directory to write links.xml and profile.xml (default: labslinks)"
+    )
+    labslinks_parser.add_argument(
+        "--provider-name",
+        default="Sage Bionetworks",
+        help="Provider display name (default: Sage Bionetworks)"
+    )
+    labslinks_parser.add_argument(
+        "--provider-description",
+        default="Data available via Synapse, the Sage Bionetworks data sharing platform",
+        help="Provider description shown alongside links"
+    )
+    labslinks_parser.add_argument(
+        "--provider-email",
+        default="act@sagebase.org",
+        help="Provider contact email (default: act@sagebase.org)"
+    )
+    labslinks_parser.add_argument(
+        "--synapse-pat",
+        help="Synapse Personal Access Token (can also use SERVICE_TOKEN or SYNAPSE_PAT env var)"
+    )
+
+    # Each subcommand's handler imports its own dependencies
+    local_parser.set_defaults(func=_cmd_process)
+    http_parser.set_defaults(func=_cmd_http)
+    combine_parser.set_defaults(func=_cmd_combine)
+    workflow_parser.set_defaults(func=run_automated_workflow)
+    ebisearch_parser.set_defaults(func=run_ebisearch_workflow)
+    labslinks_parser.set_defaults(func=run_labslinks_workflow)
 
     args = parser.parse_args()
 
@@ -249,69 +307,58 @@ def main() -> None:
     setup_logging(args.verbose)
     logger = logging.getLogger("synapse_miner.cli")
     
-    # Create miner instance
-    miner = SynapseMiner(context_size=args.context_size)
-    
+    handler = getattr(args, "func", None)
+    if handler is None:
+        parser.print_help()
+        sys.exit(1)
+        
     try:
-        if args.command == "process":
-            # Process local file
-            if not args.file.exists():
-                logger.error(f"File does not exist: {args.file}")
-                sys.exit(1)
-                
-            logger.info(f"Processing file: {args.file}")
-            findings = miner.process_file(str(args.file))
-            
-            if findings:
-                # Save results
-                import pandas as pd
-                df = pd.DataFrame(findings)
-                df.to_csv(args.output, index=False)
-                logger.info(f"Saved {len(findings)} findings to {args.output}")
-            else:
-                logger.warning("No findings to save")
-                
-        elif args.command == "http":
-            # Process HTTP files
-            logger.info(f"Processing files from {args.url}")
-            miner.process_http_files(
-                base_url=args.url,
-                output_path=str(args.output),
-                start_from=args.start_from,
-                max_files=args.max_files
-            )
-            
-        elif args.command == "combine":
-            # Combine results
-            if not COMBINE_AVAILABLE:
-                logger.error("Combine functionality requires pandas. Please install: pip install pandas")
-                sys.exit(1)
-            combine_results(args.output, args.directory, args.pattern)
-            
-        elif args.command == "workflow" and SYNAPSE_AVAILABLE:
-            # Run automated workflow
-            run_automated_workflow(args, logger)
-
-        elif args.command == "ebisearch" and SYNAPSE_AVAILABLE:
-            run_ebisearch_workflow(args, logger)
-
-        elif args.command == "labslinks" and SYNAPSE_AVAILABLE:
-            # Generate LabLinks XML from Synapse table
-            run_labslinks_workflow(args, logger)
-
-        else:
-            parser.print_help()
-            sys.exit(1)
-            
+        handler(args, logger)
     except Exception as e:
         logger.error(f"Error: {e}")
         sys.exit(1)
 
+def _cmd_process(args, logger):
+    """Process a local XML file."""
+    if not os.path.exists(args.file):
+        logger.error(f"File does not exist: {args.file}")
+        sys.exit(1)
+        
+    from .core import SynapseMiner
+    miner = SynapseMiner(context_size=args.context_size, max_workers=args.workers,
+                         cache_path=args.cache)
+    logger.info(f"Processing file: {args.file}")
+    # process_file streams the findings to the CSV itself
+    findings = miner.process_file(args.file, output_path=args.output)
+    
+    if not findings:
+        logger.warning("No findings to save")
+
+def _cmd_http(args, logger):
+    """Process XML files from an HTTP server."""
+    from .core import SynapseMiner
+    miner = SynapseMiner(context_size=args.context_size, max_workers=args.workers)
+    logger.info(f"Processing files from {args.url}")
+    miner.process_http_files(
+        base_url=args.url,
+        output_path=args.output,
+        start_from=args.start_from,
+        max_files=args.max_files,
+        concurrency=args.concurrency
+    )
+
+def _cmd_combine(args, logger):
+    """Combine batch CSV files into one."""
+    from synapse_miner.utils.data_utils import combine_results
+    combine_results(args.output, args.directory, args.pattern)
+
 def run_automated_workflow(args, logger):
     """Run the automated weekly workflow with Synapse integration."""
-    import os
-    import glob
-    from pathlib import Path
+    from .core import SynapseMiner
+    from synapse_miner.utils.tracking import ProcessingTracker
+    from synapse_miner.utils.data_utils import batch_source_name
+    
+    SynapseUploader = _import_synapse_uploader(logger)
     
     try:
         # Initialize tracker
@@ -334,8 +381,8 @@ def run_automated_workflow(args, logger):
             logger.error("Please check your SERVICE_TOKEN or SYNAPSE_PAT environment variable or --synapse-pat argument")
             sys.exit(1)
         
-        # Create miner instance  
-        miner = SynapseMiner(context_size=args.context_size)
+        # One miner processes every file in the run
+        miner = SynapseMiner(context_size=args.context_size, max_workers=args.workers)
         
         # Determine start file based on last processed PMC ID
         start_from = None
@@ -346,14 +393,20 @@ def run_automated_workflow(args, logger):
             logger.info(f"Will start from PMC ID >= {last_pmc_id}")
             
         # Clean up any existing batch files from previous runs
-        batch_pattern = f"{args.output}.*.csv"
-        existing_batch_files = glob.glob(batch_pattern)
-        for batch_file in existing_batch_files:
+        removed_count = 0
+        for batch_file in _iter_batch_files(args.output):
             try:
-                os.remove(batch_file)
-                logger.info(f"Removed old batch file: {batch_file}")
-            except Exception as e:
+                os.unlink(batch_file)
+            except FileNotFoundError:
+                # Already gone (e.g. removed by a concurrent run)
+                continue
+            except OSError as e:
                 logger.warning(f"Could not remove old batch file {batch_file}: {e}")
+                continue
+            removed_count += 1
+            logger.debug(f"Removed old batch file: {batch_file}")
+        if removed_count:
+            logger.info(f"Removed {removed_count} old batch files")
         
         # Process files from HTTP server
         logger.info(f"Starting processing from URL: {args.url}")
@@ -362,15 +415,15 @@ def run_automated_workflow(args, logger):
                 base_url=args.url,
                 output_path=args.output,
                 start_from=start_from,
-                max_files=args.max_files
+                max_files=args.max_files,
+                concurrency=args.concurrency
             )
         except Exception as e:
             logger.error(f"Failed to process files from HTTP server: {e}")
             sys.exit(1)
         
         # Find generated batch files
-        batch_files = glob.glob(batch_pattern)
-        batch_files.sort()  # Process in order
+        batch_files = sorted(_iter_batch_files(args.output), key=_batch_sort_key)  # Process in PMC order
         
         if not batch_files:
             logger.warning("No batch files were generated")
@@ -383,7 +436,8 @@ def run_automated_workflow(args, logger):
             success = synapse_uploader.batch_upload_workflow(
                 batch_files=batch_files,
                 folder_id=args.folder_id,
-                table_id=args.table_id
+                table_id=args.table_id,
+                max_workers=args.upload_concurrency
             )
         except Exception as e:
             logger.error(f"Failed during Synapse upload workflow: {e}")
@@ -393,13 +447,12 @@ def run_automated_workflow(args, logger):
             # Update tracking file with the last processed batch
             # Extract PMC ID from the last batch file processed
             last_batch_file = batch_files[-1]
-            filename = Path(last_batch_file).name
+            filename = os.path.basename(last_batch_file)
             
             # Extract the XML filename from the batch filename
-            # Format: results.csv.{xml_filename}.csv
-            parts = filename.split('.')
-            if len(parts) >= 3:
-                xml_filename = '.'.join(parts[2:-1])  # Get middle parts
+            # Format: {output}.{xml_filename}.csv
+            xml_filename = batch_source_name(filename, os.path.basename(args.output))
+            if xml_filename:
                 last_processed_pmc = tracker.extract_starting_pmc_id(xml_filename)
                 
                 if last_processed_pmc:
@@ -422,6 +475,8 @@ def run_labslinks_workflow(args, logger):
     import os
     from synapse_miner.utils.xml_generator import generate_profile_xml, generate_links_xml
 
+    SynapseUploader = _import_synapse_uploader(logger)
+
     # Initialize Synapse uploader
     try:
         token = args.synapse_pat or os.getenv('SERVICE_TOKEN') or os.getenv('SYNAPSE_PAT')
@@ -470,6 +525,8 @@ def run_ebisearch_workflow(args, logger):
     import os
     from synapse_miner.utils.ebisearch_generator import generate_ebisearch_xml
 
+    SynapseUploader = _import_synapse_uploader(logger)
+
     token = args.synapse_pat or os.getenv('SYNAPSE_PAT')
     try:
         synapse_uploader = SynapseUploader(pat=token)
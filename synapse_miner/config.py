@@ -4,10 +4,21 @@ Configuration module for Synapse Miner.
 
 import os
 import json
+import queue
+import atexit
 import logging
-from typing import Dict, Optional
+import logging.handlers
+from typing import Dict, List, Optional
 from pathlib import Path
 
+def _use_direct_handlers(queue_handler: logging.Handler, handlers: List[logging.Handler]):
+    """Replace the root queue handler with the listener's handlers."""
+    root = logging.getLogger()
+    if queue_handler in root.handlers:
+        root.removeHandler(queue_handler)
+        for handler in handlers:
+            root.addHandler(handler)
+
 class SynapseMinerConfig:
     """Configuration manager for Synapse Miner."""
     
@@ -55,15 +66,40 @@ class SynapseMinerConfig:
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir)
             
+        # basicConfig is a no-op once the root logger has handlers; return early
+        # so repeated instances do not open more files or start more listeners
+        if logging.getLogger().handlers:
+            return
+            
+        # Log calls only enqueue records; a background listener thread owns the
+        # file and console handlers so slow log storage does not block processing
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        # The queue handler only merges args into the message; the listener's
+        # handlers apply the full format
         logging.basicConfig(
             level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
+            format='%(message)s',
+            handlers=[queue_handler]
         )
         
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        # Flush queued records when the interpreter exits
+        atexit.register(listener.stop)
+        
+        if hasattr(os, 'register_at_fork'):
+            # Forked children (e.g. ProcessPoolExecutor workers) inherit the queue
+            # handler but not the listener thread, so they log directly instead
+            os.register_at_fork(
+                after_in_child=lambda: _use_direct_handlers(queue_handler, handlers)
+            )
+        
     def get(self, key: str, default=None):
         """Get configuration value."""
         return self.config.get(key, default)
@@ -4,17 +4,21 @@ Core functionality for the Synapse ID Mining package.
 
 import re
 import os
+import csv
 import gzip
-import xml.etree.ElementTree as ET
-import pandas as pd
+import mmap
 import logging
-import urllib.request
 import tempfile
 import shutil
 import time
-from typing import List, Dict, Optional, Iterator, Tuple
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional, Iterator, Tuple, Union
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from itertools import islice
+from lxml import etree
+import lxml.html
+import urllib3
+from urllib3.util.retry import Retry
 from rich.progress import (
     Progress,
     TextColumn,
@@ -27,26 +31,106 @@ from rich.progress import (
 
 logger = logging.getLogger("synapse_miner.core")
 
-def process_article(article_xml: str, context_size: int) -> Tuple[Optional[str], List[Dict]]:
-    """Process a single article in a worker process."""
+try:
+    # ISA-L's DEFLATE decoder is several times faster than zlib's
+    from isal.igzip import open as _gzip_open
+except ImportError:
+    _gzip_open = gzip.open
+
+# Compiled once at import so worker processes and repeated calls reuse them.
+# Look for 'syn' followed by 7-12 digits, ensuring it's not part of a larger number
+_SYNAPSE_RE = re.compile(r'(?<!\d)syn\d{7,12}(?!\d)', re.IGNORECASE)
+# Cheap test on the raw article bytes: a Synapse ID in the extracted text
+# needs 'syn' directly followed by a digit in the source XML
+_SYNAPSE_PREFILTER_RE = re.compile(rb'syn\d', re.IGNORECASE)
+_PMC_ID_RE = re.compile(rb'(?:PMC|pmc)(\d+)')
+_PMC_RANGE_RE = re.compile(r'PMC(\d+)_PMC(\d+)')
+_PMC_START_RE = re.compile(r'PMC(\d+)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Comments and processing instructions are dropped so their text is not mined
+_XML_PARSER = etree.XMLParser(huge_tree=True, remove_comments=True, remove_pis=True)
+
+# Article sections whose text is searched for Synapse IDs
+_TEXT_SECTIONS = (".//article-title", ".//abstract", ".//body", ".//back")
+
+# Browser-like headers sent with every request to the Europe PMC server
+_HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+}
+
+# Downloads are retried by _download_file's own loop, which also covers
+# failures partway through the body; urllib3 only follows redirects
+_DOWNLOAD_RETRIES = Retry(total=None, connect=0, read=0, status=0, other=0, redirect=5)
+
+# Articles sent to a worker per task
+_ARTICLE_CHUNK_SIZE = 32
+
+# Column order of the findings CSV files
+FINDING_FIELDS = ("pmcid", "synid", "context")
+
+def _default_worker_count() -> int:
+    """Return the number of CPUs this process may run on.
+    
+    Unlike os.cpu_count(), sched_getaffinity respects CPU pinning (e.g. a
+    container's cpuset), so the pool is not oversubscribed. CPU quotas
+    (cgroup cpu.max, e.g. docker --cpus) are not reflected; use --workers.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        # Not available on macOS or Windows
+        return os.cpu_count() or 1
+
+def _write_findings_csv(output_path: str, findings: List[Dict]) -> None:
+    """Write findings to a CSV file row by row, without building a DataFrame."""
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FINDING_FIELDS, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(findings)
+
+def process_article(article_xml: Union[bytes, str], context_size: int) -> Tuple[Optional[str], List[Dict]]:
+    """Process a single article in a worker process.
+    
+    The article is normally the raw UTF-8 bytes sliced out of the input file,
+    which lxml decodes itself; str input is encoded first.
+    
+    Each Synapse ID is reported at most once per article, with the context
+    of its first mention.
+    
+    Articles that do not contain 'syn' followed by a digit (case-insensitively)
+    cannot contain a Synapse ID and return (None, []) without being parsed.
+    """
     findings = []
     pmc_id = None
     
+    # lxml rejects str input that carries an encoding declaration
+    if isinstance(article_xml, str):
+        article_xml = article_xml.encode('utf-8')
+    
+    # Most articles have no Synapse IDs; a C-level scan lets them skip XML
+    # parsing entirely
+    if not _SYNAPSE_PREFILTER_RE.search(article_xml):
+        return None, []
+        
     try:
         # Parse XML
-        root = ET.fromstring(article_xml)
+        root = etree.fromstring(article_xml, parser=_XML_PARSER)
         
         # Extract PMC ID
-        for article_id in root.findall(".//article-id"):
+        for article_id in root.iterfind(".//article-id"):
             if article_id.get("pub-id-type") in ["pmc", "pmcid"]:
                 pmc_id = article_id.text
                 break
                 
         if not pmc_id:
             # Try regex as fallback
-            pmc_id_match = re.search(r'(?:PMC|pmc)(\d+)', article_xml)
+            pmc_id_match = _PMC_ID_RE.search(article_xml)
             if pmc_id_match:
-                pmc_id = f"PMC{pmc_id_match.group(1)}"
+                pmc_id = f"PMC{pmc_id_match.group(1).decode('ascii')}"
             else:
                 return None, []
                 
@@ -54,253 +138,278 @@ def process_article(article_xml: str, context_size: int) -> Tuple[Optional[str],
         if not pmc_id.startswith("PMC"):
             pmc_id = f"PMC{pmc_id}"
                 
-        # Extract text content from relevant sections
+        # Extract text content from the title, abstract, body and back matter
+        # (references); itertext walks each subtree in C, and separating the
+        # text nodes with spaces keeps words in adjacent elements apart
         text_parts = []
-        
-        def extract_text(element):
-            """Recursively extract text from an element and its children."""
-            if element is None:
-                return ""
-                
-            # Get direct text
-            text = element.text or ""
-            
-            # Get text from all children
-            for child in element:
-                child_text = extract_text(child)
-                # Add a space before child text if needed
-                if child_text and text and not text.endswith(' '):
-                    text += ' '
-                text += child_text
-                # Add tail text (text after the element)
-                if child.tail:
-                    # Add a space before tail text if needed
-                    if text and not text.endswith(' '):
-                        text += ' '
-                    text += child.tail
-                    
-            return text.strip()
-            
-        # Extract from title
-        title = root.find(".//article-title")
-        if title is not None:
-            text_parts.append(extract_text(title))
-            
-        # Extract from abstract
-        abstract = root.find(".//abstract")
-        if abstract is not None:
-            text_parts.append(extract_text(abstract))
-                    
-        # Extract from body
-        body = root.find(".//body")
-        if body is not None:
-            text_parts.append(extract_text(body))
-                    
-        # Extract from back matter (references)
-        back = root.find(".//back")
-        if back is not None:
-            text_parts.append(extract_text(back))
+        for path in _TEXT_SECTIONS:
+            section = root.find(path)
+            if section is not None:
+                text_parts.append(' '.join(section.itertext()).strip())
                     
         # Join all text parts with spaces and clean up whitespace
         text = ' '.join(text_parts)
         # Replace multiple spaces with single space
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
+        
+        # Bioregistry-prefixed PMC ID shared by every finding in this article
+        pmcid = f"pmc:{pmc_id}"
+        
+        # Synapse IDs already reported for this article; only the first valid
+        # mention of each ID is kept
+        seen_ids = set()
         
         # Find Synapse IDs with improved pattern matching
-        # Look for 'syn' followed by 7-12 digits, ensuring it's not part of a larger number
-        synapse_pattern = re.compile(r'(?<!\d)syn\d{7,12}(?!\d)', re.IGNORECASE)
-        for match in synapse_pattern.finditer(text):
+        for match in _SYNAPSE_RE.finditer(text):
             # Get 25 characters before and after the Synapse ID
-            start = max(0, match.start() - 25)
-            end = min(len(text), match.end() + 25)
-            context = text[start:end].strip()
+            # (slicing already clamps the end to len(text))
+            start, end = match.span()
+            context = text[max(0, start - 25):end + 25].strip()
             
             # Extract the Synapse ID and ensure it's properly formatted
+            # (_SYNAPSE_RE already guarantees 'syn' followed by 7-12 digits)
             syn_id = match.group(0).lower()  # Convert to lowercase for consistency
             
-            # Additional validation to ensure it's a valid Synapse ID
-            # Synapse IDs should be between 7-12 digits after 'syn'
-            if not re.match(r'^syn\d{7,12}$', syn_id):
-                continue
-                
             # Skip if context is too short or doesn't contain the Synapse ID
             if len(context) < 10 or syn_id not in context:
                 continue
+                
+            if syn_id in seen_ids:
+                continue
+            seen_ids.add(syn_id)
             
             # Clean up the context for CSV output
             # Replace any double quotes with single quotes
             context = context.replace('"', "'")
             
             findings.append({
-                "pmcid": f"pmc:{pmc_id}",
+                "pmcid": pmcid,
                 "synid": syn_id,
                 "context": context
             })
             
-    except ET.ParseError as e:
-        logger.error(f"Error parsing XML: {e}")
+    except etree.XMLSyntaxError as e:
+        logger.error("Error parsing XML: %s", e)
         return None, []
     except Exception as e:
-        logger.error(f"Error processing article: {e}")
+        logger.error("Error processing article: %s", e)
         return None, []
         
     return pmc_id, findings
 
+def process_article_chunk(articles: List[Union[bytes, str]], context_size: int) -> List[Dict]:
+    """Process a chunk of articles in a worker process, returning their findings.
+    
+    Sending articles to the pool in chunks amortizes the IPC round-trip over
+    many (mostly finding-free) articles.
+    """
+    findings = []
+    for article_xml in articles:
+        findings.extend(process_article(article_xml, context_size)[1])
+    return findings
+
 class SynapseMiner:
     """A tool for mining Synapse IDs from scientific articles."""
     
-    def __init__(self, context_size: int = 100, max_workers: Optional[int] = None):
+    def __init__(self, context_size: int = 100, max_workers: Optional[int] = None,
+                 cache_path: Optional[str] = None):
         """
         Initialize the SynapseMiner.
         
         Args:
             context_size: Number of characters to include around each Synapse ID
-            max_workers: Maximum number of worker processes to use
+            max_workers: Maximum number of worker processes to use (defaults to
+                the number of CPUs available to this process)
+            cache_path: Optional path to a findings cache so unchanged local
+                files are not re-scanned by process_file
         """
         self.context_size = context_size
-        self.max_workers = max_workers or os.cpu_count()
-        self.synapse_pattern = re.compile(r'syn\d{7,12}', re.IGNORECASE)
+        self.max_workers = max_workers or _default_worker_count()
+        self.synapse_pattern = _SYNAPSE_RE
+        self.cache = None
+        if cache_path:
+            from .utils.cache import FindingsCache
+            self.cache = FindingsCache(cache_path)
         
-        # Set up a custom opener with User-Agent and timeout
-        self.opener = urllib.request.build_opener()
-        self.opener.addheaders = [
-            ('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'),
-            ('Accept', 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'),
-            ('Accept-Language', 'en-US,en;q=0.5'),
-            ('Connection', 'keep-alive'),
-        ]
-        urllib.request.install_opener(self.opener)
+        # Pooled HTTP client so the directory listing and every file download
+        # reuse connections to the server; for the listing, connection errors
+        # and busy responses are retried with exponential backoff (downloads
+        # override this with _DOWNLOAD_RETRIES)
+        self.http = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=8,
+            headers=_HTTP_HEADERS,
+            retries=Retry(total=3, backoff_factor=1, status_forcelist=[502, 503, 504])
+        )
         
-    def _make_request(self, url: str, max_retries: int = 3, retry_delay: int = 5, timeout: int = 30) -> str:
-        """Make an HTTP request with retries and proper headers."""
+    def _make_request(self, url: str, timeout: int = 30) -> str:
+        """Make an HTTP GET request with retries and proper headers."""
+        response = self.http.request('GET', url, timeout=timeout)
+        if response.status != 200:
+            raise Exception(f"HTTP Error {response.status} requesting {url}")
+        return response.data.decode('utf-8')
+        
+    def _download_file(self, url: str, local_path: str, max_retries: int = 3, retry_delay: int = 5) -> str:
+        """Download a file with retries, streaming it to disk and returning the local path."""
         for attempt in range(max_retries):
             try:
-                with urllib.request.urlopen(url, timeout=timeout) as response:
-                    return response.read().decode('utf-8')
-            except urllib.error.HTTPError as e:
-                if e.code == 503 and attempt < max_retries - 1:
-                    logger.warning(f"Server busy (503), retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    continue
-                raise
+                # Save the raw bytes; a .xml.gz must not be decompressed in transit
+                response = self.http.request('GET', url, preload_content=False, decode_content=False,
+                                             retries=_DOWNLOAD_RETRIES,
+                                             timeout=urllib3.Timeout(connect=30, read=300))
+                try:
+                    if response.status != 200:
+                        raise Exception(f"HTTP Error {response.status} downloading {url}")
+                    with open(local_path, 'wb') as f:
+                        shutil.copyfileobj(response, f, 1024 * 1024)
+                finally:
+                    response.release_conn()
+                return local_path
             except Exception as e:
                 if attempt < max_retries - 1:
-                    logger.warning(f"Error making request, retrying in {retry_delay} seconds...")
+                    logger.warning(f"Error downloading {url}: {e}, retrying in {retry_delay} seconds...")
                     time.sleep(retry_delay)
                     continue
                 raise
                 
-        raise Exception(f"Failed to make request after {max_retries} attempts")
+        raise Exception(f"Failed to download {url} after {max_retries} attempts")
+            
+    def _iter_articles(self, file_path: str, is_gzipped: bool = False, chunk_size: int = 10 * 1024 * 1024) -> Iterator[bytes]:
+        """Iterate over articles in the file using a memory-efficient approach.
         
-    def _download_file(self, url: str, local_path: str, progress: Optional[Progress] = None, task: Optional[int] = None) -> None:
-        """Download a file with progress tracking and timeout."""
-        try:
-            def report_hook(count, block_size, total_size):
-                if progress and task is not None and total_size > 0:
-                    if progress.tasks[task].total is None:
-                        progress.update(task, total=total_size)
-                    progress.update(task, advance=block_size)
-                
-            urllib.request.urlretrieve(url, local_path, reporthook=report_hook)
-                
-        except Exception as e:
-            logger.error(f"Error downloading {url}: {e}")
-            raise
+        Articles are yielded as undecoded bytes; process_article hands them
+        straight to lxml, so the stream is never decoded to str.
+        """
+        if not is_gzipped:
+            yield from self._iter_articles_mmap(file_path)
+            return
             
-    def _iter_articles(self, file_path: str, is_gzipped: bool = False, chunk_size: int = 10 * 1024 * 1024) -> Iterator[str]:
-        """Iterate over articles in the file using a memory-efficient approach."""
-        opener = gzip.open if is_gzipped else open
-        buffer = ""
+        buffer = b""
         
-        with opener(file_path, 'rt', encoding='utf-8') as f:
+        with _gzip_open(file_path, 'rb') as f:
             while True:
                 chunk = f.read(chunk_size)
-                if not chunk and not buffer:
+                if not chunk:  # End of file
                     break
                     
                 buffer += chunk
                 
-                while '<article ' in buffer and '</article>' in buffer:
-                    start = buffer.find('<article ')
-                    end = buffer.find('</article>', start) + len('</article>')
+                # Scan forward from the last complete article instead of
+                # re-slicing the buffer after each one, so every chunk is
+                # searched and copied once
+                pos = 0
+                while True:
+                    start = buffer.find(b'<article ', pos)
+                    if start == -1:
+                        # Keep a possible partial '<article ' at the end of the chunk
+                        pos = max(pos, len(buffer) - len(b'<article ') + 1)
+                        break
+                    end = buffer.find(b'</article>', start)
+                    if end == -1:
+                        # Article continues in the next chunk
+                        pos = start
+                        break
+                    end += len(b'</article>')
                     
-                    if start == -1 or end == -1:
-                                    break
-                        
                     yield buffer[start:end]
-                    buffer = buffer[end:]
+                    pos = end
                     
-                if not chunk:  # End of file
-                    break
+                buffer = buffer[pos:]
                     
-    def _process_xml_file(self, file_path: str, is_gzipped: bool = False, progress: Optional[Progress] = None, task: Optional[int] = None) -> List[Dict]:
-        """Process an XML file and extract Synapse IDs using parallel processing."""
+    def _iter_articles_mmap(self, file_path: str) -> Iterator[bytes]:
+        """Iterate over articles in an uncompressed file by memory-mapping it.
+        
+        The OS pages the file in on demand and only the article slices are
+        copied out, so the whole document is never read into memory.
+        """
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = 0
+                while True:
+                    start = mm.find(b'<article ', pos)
+                    if start == -1:
+                        break
+                    end = mm.find(b'</article>', start)
+                    if end == -1:
+                        break
+                    end += len(b'</article>')
+                    
+                    yield mm[start:end]
+                    pos = end
+                    
+    def _process_xml_file(self, file_path: str, is_gzipped: bool = False, progress: Optional[Progress] = None, task: Optional[int] = None) -> Tuple[List[Dict], bool]:
+        """Process an XML file and extract Synapse IDs using parallel processing.
+        
+        Returns:
+            The findings, and whether the whole file was scanned without errors.
+            Errors are logged and the findings gathered so far still returned.
+        """
         findings = []
-        article_count = 0
+        complete = True
+        scanned_count = 0
         processed_count = 0
         synapse_count = 0
         
         try:
-            # Count articles (memory efficient)
-            logger.info("Counting articles in file...")
-            with (gzip.open(file_path, 'rt', encoding='utf-8') if is_gzipped 
-                  else open(file_path, 'rt', encoding='utf-8')) as f:
-                article_count = sum(1 for line in f if '<article ' in line)
-                        
-            logger.info(f"Found {article_count} articles to process")
+            # The article total is not known up front (counting it would take
+            # a second decompression pass), so the progress bar is indeterminate
+            if progress and task is not None:
+                progress.update(task, total=None, completed=0)
             
-            # Only show progress bar if we have articles to process
-            if article_count > 0 and progress and task is not None:
-                progress.update(task, total=article_count, completed=0)
-            
-            # Process articles in parallel
+            # Process articles in parallel, keeping a bounded window of chunks
+            # in flight: the pool never idles waiting for a batch to drain, and
+            # only about two chunks per worker are held in memory at once
+            max_in_flight = 2 * self.max_workers
             with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit articles in batches to avoid memory issues
-                batch_size = 100
-                article_iter = self._iter_articles(file_path, is_gzipped)
+                # Only articles that can contain a Synapse ID are sent to the
+                # pool; the rest are counted and dropped here, saving their IPC
+                def candidate_articles():
+                    nonlocal scanned_count
+                    for article_xml in self._iter_articles(file_path, is_gzipped):
+                        scanned_count += 1
+                        if _SYNAPSE_PREFILTER_RE.search(article_xml):
+                            yield article_xml
+                            
+                article_iter = candidate_articles()
+                in_flight = deque()
                 
-                while True:
-                    # Get next batch of articles
-                    batch = list(islice(article_iter, batch_size))
-                    if not batch:
-                        break
-                        
-                    # Submit batch for processing
-                    futures = [
-                        executor.submit(process_article, article, self.context_size)
-                        for article in batch
-                    ]
+                def submit_next_chunk():
+                    chunk = list(islice(article_iter, _ARTICLE_CHUNK_SIZE))
+                    if chunk:
+                        in_flight.append((len(chunk), executor.submit(process_article_chunk, chunk, self.context_size)))
+                    return bool(chunk)
                     
-                    # Process results as they complete
-                    for future in as_completed(futures):
-                        try:
-                            pmc_id, article_findings = future.result()
-                            findings.extend(article_findings)
-                            synapse_count += len(article_findings)
-                            processed_count += 1
-                            if progress and task is not None:
-                                # Update progress with percentage of articles processed
-                                progress.update(task, 
-                                             completed=processed_count,
-                                             description=f"Processing articles ({processed_count}/{article_count}, found {synapse_count} Synapse IDs)")
-                        except Exception as e:
-                            logger.error(f"Error processing article: {e}")
-                            processed_count += 1
-                            if progress and task is not None:
-                                progress.update(task, 
-                                             completed=processed_count,
-                                             description=f"Processing articles ({processed_count}/{article_count}, found {synapse_count} Synapse IDs)")
+                while len(in_flight) < max_in_flight and submit_next_chunk():
+                    pass
+                    
+                # Collect chunks in submission order so output order is stable
+                while in_flight:
+                    chunk_size, future = in_flight.popleft()
+                    try:
+                        chunk_findings = future.result()
+                        findings.extend(chunk_findings)
+                        synapse_count += len(chunk_findings)
+                    except Exception as e:
+                        # process_article handles its own errors, so this is a pool failure
+                        logger.error("Error processing article chunk: %s", e)
+                        complete = False
+                    processed_count += chunk_size
+                    submit_next_chunk()
+                    
+                    if progress and task is not None:
+                        progress.update(task, completed=scanned_count,
+                                        description=f"Processing articles ({scanned_count} scanned, found {synapse_count} Synapse IDs)")
                             
-            # Check if we processed all articles
-            if processed_count < article_count:
-                logger.warning(f"Only processed {processed_count} out of {article_count} articles")
-            elif processed_count > article_count:
-                logger.warning(f"Processed {processed_count} articles but only expected {article_count}")
+            logger.info(f"Scanned {scanned_count} articles from {os.path.basename(file_path)}, "
+                        f"parsed {processed_count} that may contain Synapse IDs")
                 
         except Exception as e:
             logger.error(f"Error processing file {file_path}: {e}")
+            complete = False
             
-        return findings
+        return findings, complete
         
     def process_file(self, file_path: str, output_path: Optional[str] = None) -> List[Dict]:
         """Process a local file and extract Synapse IDs."""
@@ -308,20 +417,27 @@ class SynapseMiner:
             logger.error(f"File does not exist: {file_path}")
             return []
 
-        is_gzipped = file_path.lower().endswith('.gz')
-        findings = self._process_xml_file(file_path, is_gzipped)
+        findings = self.cache.get(file_path, self.context_size) if self.cache else None
+        if findings is not None:
+            logger.info(f"Using {len(findings)} cached findings for {file_path}")
+        else:
+            is_gzipped = file_path.lower().endswith('.gz')
+            findings, complete = self._process_xml_file(file_path, is_gzipped)
+            # Only a clean, complete scan may be reused on later runs
+            if self.cache and complete:
+                self.cache.put(file_path, self.context_size, findings)
         
         # Save results if output path is provided
         if output_path and findings:
-            df = pd.DataFrame(findings)
-            df.to_csv(output_path, index=False)
+            _write_findings_csv(output_path, findings)
             logger.info(f"Saved {len(findings)} findings to {output_path}")
             
         return findings
         
     def process_http_files(self, base_url: str, output_path: str, 
                          start_from: Optional[str] = None, 
-                         max_files: Optional[int] = None) -> None:
+                         max_files: Optional[int] = None,
+                         concurrency: int = 2) -> None:
         """
         Process XML files from an HTTP server.
         
@@ -330,21 +446,27 @@ class SynapseMiner:
             output_path: Path to save results
             start_from: Filename to start processing from
             max_files: Maximum number of files to process
+            concurrency: Number of files to download ahead of the one being
+                processed (each prefetched file is held in a temporary directory)
         """
         # Create temporary directory
         temp_dir = tempfile.mkdtemp()
+        # Main results file, opened on the first findings and appended per file
+        output_file = None
         
         try:
             # Get directory listing
             logger.info("Fetching directory listing...")
             html = self._make_request(base_url)
                 
-            # Extract file URLs and parse PMC IDs
+            # Extract file URLs and parse PMC IDs; lxml's HTML parser copes with
+            # any quoting or attribute order in the listing's links
             file_entries = []
-            for match in re.finditer(r'<a href="([^"]+\.xml\.gz)"', html):
-                filename = match.group(1)
+            for filename in lxml.html.fromstring(html).xpath('//a/@href'):
+                if not filename.endswith('.xml.gz'):
+                    continue
                 # Extract PMC ID range
-                pmc_match = re.search(r'PMC(\d+)_PMC(\d+)', filename)
+                pmc_match = _PMC_RANGE_RE.search(filename)
                 if pmc_match:
                     start_pmc = int(pmc_match.group(1))
                     end_pmc = int(pmc_match.group(2))
@@ -369,7 +491,7 @@ class SynapseMiner:
             # Find starting point
             if start_from:
                 # Try to extract PMC ID range from start_from (format: PMC123_PMC456)
-                start_pmc_match = re.search(r'PMC(\d+)_PMC(\d+)', start_from)
+                start_pmc_match = _PMC_RANGE_RE.search(start_from)
                 if start_pmc_match:
                     start_pmc = int(start_pmc_match.group(1))
                     # Find the first file with PMC ID >= start_pmc
@@ -382,7 +504,7 @@ class SynapseMiner:
                         logger.warning(f"Could not find file with PMC ID >= {start_pmc}")
                 else:
                     # Try to extract simple PMC ID (format: PMC123456)
-                    simple_pmc_match = re.search(r'PMC(\d+)', start_from)
+                    simple_pmc_match = _PMC_START_RE.search(start_from)
                     if simple_pmc_match:
                         start_pmc = int(simple_pmc_match.group(1))
                         # Find the first file with PMC ID >= start_pmc
@@ -408,7 +530,8 @@ class SynapseMiner:
                 file_urls = file_urls[:max_files]
                 
             # Process files
-            all_findings = []
+            total_findings = 0
+            writer = None
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
@@ -419,76 +542,74 @@ class SynapseMiner:
                 # Create a single task for progress
                 task = progress.add_task("Processing", total=None)
                 
-                for file_url in file_urls:
-                    try:
-                        # Download file with retries
-                        local_path = os.path.join(temp_dir, os.path.basename(file_url))
+                # Download up to `concurrency` files ahead in background threads
+                # so network transfers overlap with parsing the current file
+                download_pool = ThreadPoolExecutor(max_workers=concurrency)
+                url_iter = iter(file_urls)
+                pending = deque()
+                
+                def schedule_download():
+                    next_url = next(url_iter, None)
+                    if next_url is not None:
+                        local_path = os.path.join(temp_dir, os.path.basename(next_url))
+                        pending.append((next_url, download_pool.submit(self._download_file, next_url, local_path)))
                         
-                        max_retries = 3
-                        retry_delay = 5
-                        for attempt in range(max_retries):
-                            try:
-                                # Create a custom opener with progress tracking
-                                def report_hook(count, block_size, total_size):
-                                    if total_size > 0:
-                                        # Update download progress
-                                        progress.update(task, 
-                                                     description=f"Downloading {os.path.basename(file_url)}",
-                                                     total=total_size,
-                                                     completed=count * block_size)
-                                
-                                urllib.request.urlretrieve(file_url, local_path, reporthook=report_hook)
-                                break
-                            except urllib.error.HTTPError as e:
-                                if attempt < max_retries - 1:
-                                    logger.warning(f"HTTP Error {e.code} downloading {file_url}, retrying in {retry_delay} seconds...")
-                                    time.sleep(retry_delay)
-                                    continue
-                                raise
-                            except Exception as e:
-                                if attempt < max_retries - 1:
-                                    logger.warning(f"Error downloading {file_url}, retrying in {retry_delay} seconds...")
-                                    time.sleep(retry_delay)
-                                    continue
-                                raise
+                try:
+                    for _ in range(concurrency):
+                        schedule_download()
                         
-                        # Process file
-                        progress.update(task, description=f"Processing {os.path.basename(file_url)}...")
-                        findings = self._process_xml_file(local_path, is_gzipped=True, progress=progress, task=task)
-                        all_findings.extend(findings)
+                    while pending:
+                        file_url, download = pending.popleft()
+                        schedule_download()
+                        try:
+                            # Wait for this file's download (usually already finished)
+                            progress.update(task, description=f"Downloading {os.path.basename(file_url)}")
+                            local_path = download.result()
+                            
+                            # Process file
+                            progress.update(task, description=f"Processing {os.path.basename(file_url)}...")
+                            findings, _ = self._process_xml_file(local_path, is_gzipped=True, progress=progress, task=task)
                         
-                        # Save results after each file
-                        if findings:
-                            # Create a new CSV file for this batch of results
-                            batch_output_path = f"{output_path}.{os.path.basename(file_url)}.csv"
-                            df = pd.DataFrame(findings)
-                            df.to_csv(batch_output_path, index=False)
-                            logger.info(f"Saved {len(findings)} findings from {os.path.basename(file_url)} to {batch_output_path}")
+                            # Save results after each file
+                            if findings:
+                                # Create a new CSV file for this batch of results
+                                batch_output_path = f"{output_path}.{os.path.basename(file_url)}.csv"
+                                _write_findings_csv(batch_output_path, findings)
+                                logger.info(f"Saved {len(findings)} findings from {os.path.basename(file_url)} to {batch_output_path}")
                             
-                            # Also update the main results file
-                            df = pd.DataFrame(all_findings)
-                            df.to_csv(output_path, index=False)
-                            logger.info(f"Updated main results file with {len(all_findings)} total findings")
+                                # Also append to the main results file (header written once)
+                                if writer is None:
+                                    output_file = open(output_path, 'w', newline='', encoding='utf-8')
+                                    writer = csv.DictWriter(output_file, fieldnames=FINDING_FIELDS, lineterminator='\n')
+                                    writer.writeheader()
+                                writer.writerows(findings)
+                                output_file.flush()
+                                total_findings += len(findings)
+                                logger.info(f"Updated main results file with {total_findings} total findings")
                         
-                        # Remove downloaded file
-                        os.remove(local_path)
-                        logger.info(f"Removed downloaded file: {local_path}")
+                            # Remove downloaded file
+                            os.remove(local_path)
+                            logger.debug("Removed downloaded file: %s", local_path)
                         
-                        # Update progress with number of Synapse IDs found
-                        progress.update(task, 
-                                     description=f"Processing files (found {len(all_findings)} Synapse IDs)")
-                    except Exception as e:
-                        logger.error(f"Error processing {file_url}: {e}")
-                        continue
+                            # Update progress with number of Synapse IDs found
+                            progress.update(task, 
+                                         description=f"Processing files (found {total_findings} Synapse IDs)")
+                        except Exception as e:
+                            logger.error(f"Error processing {file_url}: {e}")
+                            continue
+                finally:
+                    # Do not start downloads into a directory that is about to be removed
+                    for _, download in pending:
+                        download.cancel()
+                    download_pool.shutdown(wait=True)
                     
-            # Final save of all results
-            if all_findings:
-                df = pd.DataFrame(all_findings)
-                df.to_csv(output_path, index=False)
-                logger.info(f"Final save: {len(all_findings)} total findings saved to {output_path}")
+            if total_findings:
+                logger.info(f"Final save: {total_findings} total findings saved to {output_path}")
             else:
                 logger.warning("No findings to save")
                 
         finally:
             # Clean up
+            if output_file is not None:
+                output_file.close()
             shutil.rmtree(temp_dir)
\ No newline at end of file
@@ -1,55 +1,58 @@
 """
 Utility functions for the Synapse ID Mining package.
+
+Submodules with heavy or optional dependencies (pypdf, pandas, synapseclient)
+are imported on first access, so importing this package stays cheap. Names
+whose dependencies are missing resolve to None and their *_AVAILABLE flag
+to False.
 """
 
+from importlib import import_module
+
 from .text_processing import extract_context
 from .tracking import ProcessingTracker
-
-# Import file_utils conditionally to avoid PyPDF2 import issues
-try:
-    from .file_utils import extract_text_from_pdf, read_text_file
-    FILE_UTILS_AVAILABLE = True
-except ImportError:
-    extract_text_from_pdf = None
-    read_text_file = None
-    FILE_UTILS_AVAILABLE = False
-
-# Import combine_results conditionally to avoid pandas import issues
-try:
-    from .data_utils import combine_results
-    DATA_UTILS_AVAILABLE = True
-except ImportError:
-    combine_results = None
-    DATA_UTILS_AVAILABLE = False
-
-try:
-    from .synapse_integration import SynapseUploader
-    SYNAPSE_AVAILABLE = True
-except ImportError:
-    SynapseUploader = None
-    SYNAPSE_AVAILABLE = False
-
-try:
-    from .ebisearch_generator import generate_ebisearch_xml, load_cache
-    EBISEARCH_AVAILABLE = True
-except ImportError:
-    generate_ebisearch_xml = None
-    load_cache = None
-    EBISEARCH_AVAILABLE = False
+from .cache import FindingsCache
+
+# Lazily imported name -> (submodule, availability flag)
+_LAZY_IMPORTS = {
+    'extract_text_from_pdf': ('file_utils', 'FILE_UTILS_AVAILABLE'),
+    'iter_pdf_pages': ('file_utils', 'FILE_UTILS_AVAILABLE'),
+    'read_text_file': ('file_utils', 'FILE_UTILS_AVAILABLE'),
+    'combine_results': ('data_utils', 'DATA_UTILS_AVAILABLE'),
+    'SynapseUploader': ('synapse_integration', 'SYNAPSE_AVAILABLE'),
+    'generate_ebisearch_xml': ('ebisearch_generator', 'EBISEARCH_AVAILABLE'),
+    'load_cache': ('ebisearch_generator', 'EBISEARCH_AVAILABLE'),
+}
+_AVAILABILITY_FLAGS = {flag: module for module, flag in _LAZY_IMPORTS.values()}
+
+def _import_submodule(module_name):
+    """Import a utils submodule, returning None if its dependencies are missing."""
+    try:
+        return import_module(f".{module_name}", __name__)
+    except ImportError:
+        return None
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = _import_submodule(_LAZY_IMPORTS[name][0])
+        value = getattr(module, name) if module is not None else None
+    elif name in _AVAILABILITY_FLAGS:
+        value = _import_submodule(_AVAILABILITY_FLAGS[name]) is not None
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
 
 __all__ = [
-    'extract_context', 
-    'ProcessingTracker'
+    'extract_context',
+    'ProcessingTracker',
+    'FindingsCache',
+    'extract_text_from_pdf',
+    'iter_pdf_pages',
+    'read_text_file',
+    'combine_results',
+    'SynapseUploader',
+    'generate_ebisearch_xml',
+    'load_cache'
 ]
-
-if FILE_UTILS_AVAILABLE:
-    __all__.extend(['extract_text_from_pdf', 'read_text_file'])
-
-if DATA_UTILS_AVAILABLE:
-    __all__.append('combine_results')
-
-if SYNAPSE_AVAILABLE:
-    __all__.append('SynapseUploader')
-
-if EBISEARCH_AVAILABLE:
-    __all__.extend(['generate_ebisearch_xml', 'load_cache'])
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Persistent cache of per-file findings for the Synapse ID Mining package.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class FindingsCache:
+    """Caches the findings of local files keyed by path, mtime, size and context size."""
+
+    # Bump whenever extraction logic changes so stale findings are not reused
+    SCHEMA_VERSION = 2
+
+    def __init__(self, cache_path: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            cache_path: Path to the SQLite cache file
+        """
+        self.cache_path = cache_path
+        self.conn = sqlite3.connect(cache_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS findings ("
+            "path TEXT PRIMARY KEY, "
+            "mtime_ns INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "context_size INTEGER NOT NULL, "
+            "schema_version INTEGER NOT NULL, "
+            "findings TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+    def _file_key(self, file_path: str):
+        """Return (realpath, mtime_ns, size) identifying the current file contents."""
+        path = os.path.realpath(file_path)
+        st = os.stat(path)
+        return path, st.st_mtime_ns, st.st_size
+
+    def get(self, file_path: str, context_size: int) -> Optional[List[Dict]]:
+        """
+        Look up cached findings for a file.
+
+        Args:
+            file_path: Path to the processed file
+            context_size: Context size the findings were extracted with
+
+        Returns:
+            The cached findings, or None if the file is not cached or has changed
+        """
+        try:
+            path, mtime_ns, size = self._file_key(file_path)
+            row = self.conn.execute(
+                "SELECT findings FROM findings WHERE path = ? AND mtime_ns = ? AND size = ? "
+                "AND context_size = ? AND schema_version = ?",
+                (path, mtime_ns, size, context_size, self.SCHEMA_VERSION)
+            ).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Error reading findings cache for {file_path}: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def put(self, file_path: str, context_size: int, findings: List[Dict]) -> None:
+        """
+        Store findings for a file, replacing any previous entry for the same path.
+
+        Args:
+            file_path: Path to the processed file
+            context_size: Context size the findings were extracted with
+            findings: Findings extracted from the file
+        """
+        try:
+            path, mtime_ns, size = self._file_key(file_path)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO findings VALUES (?, ?, ?, ?, ?, ?)",
+                (path, mtime_ns, size, context_size, self.SCHEMA_VERSION, json.dumps(findings))
+            )
+            self.conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Error writing findings cache for {file_path}: {e}")
+
+    def close(self) -> None:
+        """Close the cache database."""
+        self.conn.close()
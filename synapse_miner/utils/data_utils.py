@@ -3,7 +3,8 @@ Data utility functions for the Synapse ID Mining package.
 """
 
 import os
-import pandas as pd
+import re
+import csv
 import glob
 import logging
 from pathlib import Path
@@ -11,6 +12,21 @@ from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
+def batch_source_name(batch_file: str, output_name: str) -> Optional[str]:
+    """
+    Extract the source XML file name from a batch file name.
+    
+    Args:
+        batch_file: Batch file name like 'results.csv.PMC11890001_PMC11900000.xml.gz.csv'
+        output_name: Base name of the output the batch file belongs to, like 'results.csv'
+        
+    Returns:
+        The source file name like 'PMC11890001_PMC11900000.xml.gz', or None if
+        the batch file name does not belong to output_name
+    """
+    match = re.fullmatch(rf"{re.escape(output_name)}\.(.+)\.csv", os.path.basename(batch_file))
+    return match.group(1) if match else None
+
 def combine_results(output_path: str, 
                     directory: Optional[str] = None, 
                     pattern: str = "results.csv.*.csv") -> str:
@@ -39,44 +55,73 @@ def combine_results(output_path: str,
             logger.warning(f"No files found matching pattern '{pattern}' in directory '{directory}'")
             return None
             
-        # Combine all batch files
-        all_data = []
+        # Batch files are named '{output_name}.{xml_filename}.csv'; recover the
+        # output name from a pattern like 'results.csv.*.csv'
+        output_name = pattern[:-len('.*.csv')] if pattern.endswith('.*.csv') else None
+        
+        # Copy each batch file into the output in turn, keeping only the
+        # first occurrence of each row (ignoring source_file)
+        output_file = None
+        writer = None
+        fieldnames = None
+        seen_rows = set()
         unique_synids = set()
         total_rows = 0
+        final_rows = 0
         
-        for file in batch_files:
-            try:
-                df = pd.read_csv(file)
+        try:
+            for file in batch_files:
+                # Read the whole file before writing any of it, so a file that
+                # fails partway through contributes no rows
+                try:
+                    with open(file, 'r', newline='', encoding='utf-8') as f:
+                        reader = csv.reader(f)
+                        header = next(reader, None)
+                        if header is None:
+                            raise ValueError("No columns to parse from file")
+                        if fieldnames is not None and header != fieldnames:
+                            raise ValueError(f"Columns {header} do not match {fieldnames}")
+                        rows = list(reader)
+                except Exception as e:
+                    logger.error(f"Error reading file {file}: {e}")
+                    continue
+                    
+                if writer is None:
+                    fieldnames = header
+                    output_file = open(output_path, 'w', newline='', encoding='utf-8')
+                    writer = csv.writer(output_file, lineterminator='\n')
+                    writer.writerow(fieldnames + ['source_file'])
+                    
                 # Extract source XML file name from the batch file name
-                # Format is: results.csv.{xml_filename}.csv
-                source_file = '.'.join(file.name.split('.')[2:-1])  # Get all parts except first two and last
-                # Add source file column
-                df['source_file'] = source_file
-                total_rows += len(df)
-                if 'synid' in df.columns:
-                    unique_synids.update(df['synid'].unique())
-                all_data.append(df)
-                logger.info(f"Added {len(df)} rows from {file.name}")
-            except Exception as e:
-                logger.error(f"Error reading file {file}: {e}")
-                continue
+                # Format is: {output_name}.{xml_filename}.csv
+                source_file = batch_source_name(file.name, output_name) if output_name else None
+                if source_file is None:
+                    # Name not in that format; use it without the .csv extension
+                    source_file = file.name[:-len('.csv')] if file.name.endswith('.csv') else file.name
+                synid_index = header.index('synid') if 'synid' in header else None
+                
+                for row in rows:
+                    if synid_index is not None:
+                        unique_synids.add(row[synid_index])
+                    key = tuple(row)
+                    if key in seen_rows:
+                        continue
+                    seen_rows.add(key)
+                    writer.writerow(row + [source_file])
+                    final_rows += 1
+                total_rows += len(rows)
+                logger.info(f"Added {len(rows)} rows from {file.name}")
+        finally:
+            if output_file is not None:
+                output_file.close()
                 
-        if not all_data:
+        if writer is None:
             logger.warning("No data found in any of the batch files")
             return None
             
-        # Combine all dataframes
-        combined_df = pd.concat(all_data, ignore_index=True)
-        
-        # Remove duplicates based on all columns except source_file
-        combined_df = combined_df.drop_duplicates(subset=[col for col in combined_df.columns if col != 'source_file'])
-        
-        # Save to output file
-        combined_df.to_csv(output_path, index=False)
-        
         logger.info(f"Combined {len(batch_files)} files into {output_path}")
         logger.info(f"Total rows: {total_rows} (before deduplication)")
-        logger.info(f"Final rows: {len(combined_df)} (after deduplication)")
+        logger.info(f"Final rows: {final_rows} (after deduplication)")
         logger.info(f"Unique Synapse IDs: {len(unique_synids)}")
         
         return output_path
@@ -19,12 +19,16 @@ import os
 from datetime import date
 from typing import Dict, List, Optional, Set, Tuple
 
-import json
 import math
 
 import pandas as pd
 import xml.etree.ElementTree as ET
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 _DATA_CATALOG_TABLE = "syn61609402"
@@ -139,6 +143,9 @@ def load_cache(cache_path: str) -> Dict:
     """Load the entity metadata cache from a JSON file."""
     if os.path.exists(cache_path):
         try:
+            if orjson is not None:
+                with open(cache_path, "rb") as f:
+                    return orjson.loads(f.read())
             with open(cache_path) as f:
                 return json.load(f)
         except Exception as e:
@@ -149,8 +156,12 @@ def load_cache(cache_path: str) -> Dict:
 def _save_cache(cache: Dict, cache_path: str) -> None:
     """Persist the entity metadata cache to disk."""
     os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
-    with open(cache_path, "w") as f:
-        json.dump(cache, f, indent=2)
+    if orjson is not None:
+        with open(cache_path, "wb") as f:
+            f.write(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
+    else:
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, indent=2)
     logger.debug(f"Saved cache ({len(cache)} entries) to {cache_path}")
 
 
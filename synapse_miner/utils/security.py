@@ -6,10 +6,22 @@ import os
 import logging
 from pathlib import Path
 from typing import Optional, List
-import magic
 
 logger = logging.getLogger("synapse_miner.security")
 
+try:
+    import magic
+    MAGIC_AVAILABLE = True
+except ImportError:
+    MAGIC_AVAILABLE = False
+
+# MIME types (or prefixes) accepted by validate_file
+_ALLOWED_MIME_TYPES = ('text/', 'application/pdf', 'application/xml', 'text/html', 'application/gzip', 'application/x-gzip')
+
+# Bytes read from the start of a file to detect its type; every accepted
+# type is recognizable from its header
+_MAGIC_HEADER_SIZE = 4096
+
 class SecurityError(Exception):
     """Base class for security-related errors."""
     pass
@@ -42,7 +54,8 @@ def sanitize_path(file_path: str) -> str:
     return norm_path
 
 def validate_file(file_path: str, max_size: Optional[int] = None, 
-                 allowed_extensions: Optional[List[str]] = None) -> bool:
+                 allowed_extensions: Optional[List[str]] = None,
+                 check_mime_type: bool = True) -> bool:
     """
     Validate a file for processing.
     
@@ -50,6 +63,7 @@ def validate_file(file_path: str, max_size: Optional[int] = None,
         file_path: Path to validate
         max_size: Maximum allowed file size in bytes
         allowed_extensions: List of allowed file extensions
+        check_mime_type: Whether to check the detected MIME type of the file
         
     Returns:
         True if file is valid
@@ -57,9 +71,17 @@ def validate_file(file_path: str, max_size: Optional[int] = None,
     Raises:
         FileValidationError: If validation fails
     """
+    # Check file extension first; it needs no file system access
+    if allowed_extensions is not None:
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext not in allowed_extensions:
+            raise FileValidationError(f"File extension not allowed: {ext}")
+            
     try:
-        # Check if file exists
-        if not os.path.exists(file_path):
+        # Check if file exists; one stat also provides the size checked below
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
             raise FileValidationError(f"File not found: {file_path}")
             
         # Check if file is readable
@@ -67,24 +89,19 @@ def validate_file(file_path: str, max_size: Optional[int] = None,
             raise FileValidationError(f"File not readable: {file_path}")
             
         # Check file size
-        if max_size is not None:
-            file_size = os.path.getsize(file_path)
-            if file_size > max_size:
-                raise FileValidationError(f"File too large: {file_size} bytes")
-                
-        # Check file extension
-        if allowed_extensions is not None:
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext not in allowed_extensions:
-                raise FileValidationError(f"File extension not allowed: {ext}")
+        if max_size is not None and file_stat.st_size > max_size:
+            raise FileValidationError(f"File too large: {file_stat.st_size} bytes")
                 
-        # Check file type using python-magic
-        try:
-            file_type = magic.from_file(file_path, mime=True)
-            if not file_type.startswith(('text/', 'application/pdf', 'application/xml', 'text/html', 'application/gzip', 'application/x-gzip')):
-                raise FileValidationError(f"Unsupported file type: {file_type}")
-        except ImportError:
-            logger.warning("python-magic not installed, skipping file type validation")
+        # Check file type using python-magic on the file header only
+        if check_mime_type:
+            if MAGIC_AVAILABLE:
+                with open(file_path, 'rb') as f:
+                    header = f.read(_MAGIC_HEADER_SIZE)
+                file_type = magic.from_buffer(header, mime=True)
+                if not file_type.startswith(_ALLOWED_MIME_TYPES):
+                    raise FileValidationError(f"Unsupported file type: {file_type}")
+            else:
+                logger.warning("python-magic not installed, skipping file type validation")
             
         return True
         
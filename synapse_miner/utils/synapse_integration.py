@@ -3,9 +3,12 @@ Synapse integration utilities for uploading results and managing tables.
 """
 
 import logging
+import threading
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Iterable, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +23,13 @@ except ImportError:
 class SynapseUploader:
     """Handles uploading results to Synapse."""
     
+    # PMC IDs per server-side duplicate lookup query
+    PMC_ID_QUERY_CHUNK_SIZE = 1000
+    # Above this many IDs, reading the whole pmcid column is cheaper
+    PMC_ID_QUERY_MAX_IDS = 50000
+    # Rows stored per Table upload
+    TABLE_UPLOAD_CHUNK_SIZE = 10000
+    
     def __init__(self, pat: Optional[str] = None):
         """
         Initialize Synapse client.
@@ -30,17 +40,29 @@ class SynapseUploader:
         if not SYNAPSE_AVAILABLE:
             raise ImportError("synapseclient is required for Synapse integration")
             
-        self.syn = synapseclient.Synapse()
+        self._pat = pat
+        # Per-thread clients for concurrent uploads; see batch_upload_workflow
+        self._local = threading.local()
+        self.syn = self._login()
+        logger.info("Successfully logged into Synapse")
+    
+    def _login(self) -> "synapseclient.Synapse":
+        """Create a Synapse client logged in with this uploader's credentials."""
+        syn = synapseclient.Synapse()
         try:
-            if pat:
-                self.syn.login(authToken=pat)
+            if self._pat:
+                syn.login(authToken=self._pat)
             else:
                 # Try to login using cached credentials or environment variables
-                self.syn.login()
-            logger.info("Successfully logged into Synapse")
+                syn.login()
         except Exception as e:
             logger.error(f"Failed to login to Synapse: {e}")
             raise
+        return syn
+    
+    def _init_upload_thread(self):
+        """Give an upload worker thread its own Synapse client."""
+        self._local.syn = self._login()
     
     def upload_batch_file(self, file_path: str, parent_folder_id: str, 
                          description: Optional[str] = None) -> Optional[str]:
@@ -68,8 +90,9 @@ class SynapseUploader:
                 description=description or f"Batch results from {file_path.name}"
             )
             
-            # Upload to Synapse
-            uploaded_file = self.syn.store(file_entity)
+            # Upload to Synapse, using the calling upload thread's own client
+            syn = getattr(self._local, 'syn', self.syn)
+            uploaded_file = syn.store(file_entity)
             logger.info(f"Uploaded {file_path.name} to Synapse: {uploaded_file.id}")
             return uploaded_file.id
             
@@ -77,29 +100,48 @@ class SynapseUploader:
             logger.error(f"Error uploading file {file_path}: {e}")
             return None
     
-    def get_existing_pmc_ids(self, table_id: str) -> Set[str]:
+    def get_existing_pmc_ids(self, table_id: str, pmc_ids: Optional[Iterable[str]] = None) -> Set[str]:
         """
         Get existing PMC IDs from Synapse table to avoid duplicates.
 
+        When pmc_ids is given, only those IDs are looked up, filtering on the
+        server in chunks of PMC_ID_QUERY_CHUNK_SIZE so the response scales with
+        the batch rather than the table. Very large ID sets fall back to
+        reading the whole pmcid column.
+
         Args:
             table_id: Synapse ID of the table
+            pmc_ids: Optional PMC IDs to check for
 
         Returns:
             Set of PMC IDs already in the table
         """
         try:
-            # Query to get all PMC IDs from the table
-            query = f"SELECT pmcid FROM {table_id}"
-            results = self.syn.tableQuery(query)
-            df = results.asDataFrame()
-
-            if 'pmcid' in df.columns:
-                existing_ids = set(df['pmcid'].astype(str))
-                logger.info(f"Found {len(existing_ids)} existing PMC IDs in table {table_id}")
-                return existing_ids
+            if pmc_ids is not None:
+                pmc_ids = sorted(set(pmc_ids))
+                
+            if pmc_ids is None or len(pmc_ids) > self.PMC_ID_QUERY_MAX_IDS:
+                # Query to get all PMC IDs from the table
+                queries = [f"SELECT pmcid FROM {table_id}"]
             else:
-                logger.warning(f"No 'pmcid' column found in table {table_id}")
-                return set()
+                queries = []
+                for i in range(0, len(pmc_ids), self.PMC_ID_QUERY_CHUNK_SIZE):
+                    chunk = pmc_ids[i:i + self.PMC_ID_QUERY_CHUNK_SIZE]
+                    id_list = ", ".join("'" + pmc_id.replace("'", "''") + "'" for pmc_id in chunk)
+                    queries.append(f"SELECT pmcid FROM {table_id} WHERE pmcid IN ({id_list})")
+
+            existing_ids = set()
+            for query in queries:
+                results = self.syn.tableQuery(query)
+                df = results.asDataFrame()
+
+                if 'pmcid' not in df.columns:
+                    logger.warning(f"No 'pmcid' column found in table {table_id}")
+                    return set()
+                existing_ids.update(df['pmcid'].astype(str))
+                
+            logger.info(f"Found {len(existing_ids)} existing PMC IDs in table {table_id}")
+            return existing_ids
 
         except Exception as e:
             logger.error(f"Error querying existing PMC IDs from table {table_id}: {e}")
@@ -139,8 +181,8 @@ class SynapseUploader:
             True if successful, False otherwise
         """
         try:
-            # Read the CSV file
-            df = pd.read_csv(csv_path)
+            # Read the CSV file, keeping PMC IDs as strings for the duplicate check
+            df = pd.read_csv(csv_path, dtype={'pmcid': str})
             
             if df.empty:
                 logger.info(f"No data to upload from {csv_path}")
@@ -150,21 +192,33 @@ class SynapseUploader:
 
             # Filter out duplicates if requested
             if check_duplicates:
-                existing_ids = self.get_existing_pmc_ids(table_id)
-                if existing_ids:
-                    # Filter out rows where pmcid already exists
-                    if 'pmcid' in df.columns:
-                        df = df[~df['pmcid'].astype(str).isin(existing_ids)]
+                if 'pmcid' in df.columns:
+                    # Only look up the PMC IDs present in this batch
+                    existing_ids = self.get_existing_pmc_ids(table_id, df['pmcid'].dropna())
+                    if existing_ids:
+                        # Filter out rows where pmcid already exists
+                        df = df[~df['pmcid'].isin(existing_ids)]
                         logger.info(f"Filtered out {original_count - len(df)} duplicate PMC IDs")
-                    else:
-                        logger.warning("No 'pmcid' column found in CSV data")
+                else:
+                    logger.warning("No 'pmcid' column found in CSV data")
             
             if df.empty:
                 logger.info("No new data to upload after filtering duplicates")
                 return True
             
-            # Upload to table
-            table = self.syn.store(Table(table_id, df))
+            # Upload to table in chunks so large batches do not time out;
+            # an article's rows are never split across chunks, so a failed
+            # upload cannot leave a PMC ID that the duplicate check would then
+            # treat as already uploaded
+            start = 0
+            while start < len(df):
+                end = min(start + self.TABLE_UPLOAD_CHUNK_SIZE, len(df))
+                if 'pmcid' in df.columns:
+                    while end < len(df) and df['pmcid'].iat[end] == df['pmcid'].iat[end - 1]:
+                        end += 1
+                self.syn.store(Table(table_id, df.iloc[start:end]))
+                logger.debug(f"Uploaded rows {start}-{end - 1} to table {table_id}")
+                start = end
             logger.info(f"Successfully uploaded {len(df)} new rows to table {table_id}")
             return True
             
@@ -173,14 +227,22 @@ class SynapseUploader:
             return False
     
     def batch_upload_workflow(self, batch_files: List[str], folder_id: str, 
-                            table_id: str) -> bool:
+                            table_id: str, max_workers: int = 1) -> bool:
         """
         Complete workflow for uploading multiple batch files.
         
+        With max_workers above 1, batch files are uploaded to the folder by
+        that many threads while table rows are appended one batch at a time
+        in batch_files order as their file uploads complete. The Synapse
+        client is not documented as thread-safe, so each upload thread logs
+        in with its own client and the table appends keep this one. With the
+        default of 1, files are uploaded and appended strictly in turn.
+        
         Args:
             batch_files: List of paths to batch CSV files
             folder_id: Synapse folder ID for storing individual files
             table_id: Synapse table ID for aggregated results
+            max_workers: Number of batch files to upload concurrently
             
         Returns:
             True if all uploads successful, False otherwise
@@ -188,22 +250,33 @@ class SynapseUploader:
         try:
             success_count = 0
             
-            for batch_file in batch_files:
-                logger.info(f"Processing batch file: {batch_file}")
-                
-                # Upload individual batch file to folder
-                file_id = self.upload_batch_file(batch_file, folder_id)
-                if not file_id:
-                    logger.error(f"Failed to upload batch file: {batch_file}")
-                    continue
+            executor = None
+            if max_workers > 1:
+                executor = ThreadPoolExecutor(max_workers=max_workers,
+                                              initializer=self._init_upload_thread)
+            try:
+                # Upload individual batch files to folder; the built-in map is
+                # lazy, so without an executor each upload happens in the loop
+                upload_map = executor.map if executor else map
+                file_ids = upload_map(self.upload_batch_file, batch_files, repeat(folder_id))
                 
-                # Upload new results to table
-                if not self.upload_new_results_to_table(batch_file, table_id):
-                    logger.error(f"Failed to upload results to table from: {batch_file}")
-                    continue
+                for batch_file, file_id in zip(batch_files, file_ids):
+                    logger.info(f"Processing batch file: {batch_file}")
+                    
+                    if not file_id:
+                        logger.error(f"Failed to upload batch file: {batch_file}")
+                        continue
                     
-                success_count += 1
-                logger.info(f"Successfully processed batch file: {batch_file}")
+                    # Upload new results to table
+                    if not self.upload_new_results_to_table(batch_file, table_id):
+                        logger.error(f"Failed to upload results to table from: {batch_file}")
+                        continue
+                        
+                    success_count += 1
+                    logger.info(f"Successfully processed batch file: {batch_file}")
+            finally:
+                if executor:
+                    executor.shutdown()
             
             logger.info(f"Completed batch upload: {success_count}/{len(batch_files)} successful")
             return success_count == len(batch_files)
@@ -35,7 +35,7 @@ def extract_context(text: str, start_pos: int, end_pos: int, context_size: int)
     before = text[context_start:start_pos].strip()
     after = text[end_pos:context_end].strip()
     target = text[start_pos:end_pos]
-    full = (before + " " + target + " " + after).strip()
+    full = " ".join((before, target, after)).strip()
     
     return {
         "before": before,
@@ -2,13 +2,20 @@
 Tracking utilities for managing processing state.
 """
 
+import os
+import re
 import json
 import logging
+import tempfile
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Starting PMC ID of a bundle name like 'PMC11890001_PMC11900000.xml.gz'
+_PMC_RANGE_START_RE = re.compile(r'(PMC\d+)_PMC\d+')
+
 class ProcessingTracker:
     """Manages tracking of processing state for batch operations."""
     
@@ -51,14 +58,24 @@ class ProcessingTracker:
         try:
             data = {
                 'last_processed_pmc_id': pmc_id,
-                'updated_at': f"{__import__('datetime').datetime.now().isoformat()}"
+                'updated_at': datetime.now().isoformat()
             }
             
             # Ensure directory exists
             self.tracking_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.tracking_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Write to a temporary file next to the tracking file and rename it
+            # into place, so an interrupted run never leaves a truncated file
+            fd, tmp_path = tempfile.mkstemp(dir=self.tracking_file.parent,
+                                            prefix=f".{self.tracking_file.name}.",
+                                            suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, self.tracking_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
                 
             logger.info(f"Updated tracking file with PMC ID: {pmc_id}")
             return True
@@ -76,8 +93,7 @@ class ProcessingTracker:
         Returns:
             The starting PMC ID like 'PMC11890001'
         """
-        import re
-        match = re.search(r'(PMC\d+)_PMC\d+', filename)
+        match = _PMC_RANGE_START_RE.search(filename)
         if match:
             return match.group(1)
         return None
\ No newline at end of file
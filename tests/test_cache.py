@@ -0,0 +1,83 @@
+"""
+Tests for the persistent findings cache.
+"""
+
+import os
+import tempfile
+from synapse_miner.utils import FindingsCache
+
+FINDINGS = [{"pmcid": "pmc:PMC1234567", "synid": "syn1234567", "context": "data at syn1234567"}]
+
+def test_findings_cache_roundtrip():
+    """Test storing and retrieving findings for an unchanged file."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_file = os.path.join(tmp_dir, "articles.xml")
+        with open(data_file, "w") as f:
+            f.write("<articles></articles>")
+
+        cache = FindingsCache(os.path.join(tmp_dir, "cache.sqlite"))
+        try:
+            # Nothing cached yet
+            assert cache.get(data_file, 100) is None
+
+            cache.put(data_file, 100, FINDINGS)
+            assert cache.get(data_file, 100) == FINDINGS
+
+            # A different context size is a cache miss
+            assert cache.get(data_file, 50) is None
+        finally:
+            cache.close()
+
+        # Cache persists across instances
+        cache = FindingsCache(os.path.join(tmp_dir, "cache.sqlite"))
+        try:
+            assert cache.get(data_file, 100) == FINDINGS
+        finally:
+            cache.close()
+
+def test_findings_cache_invalidated_on_change():
+    """Test that modifying a file invalidates its cached findings."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_file = os.path.join(tmp_dir, "articles.xml")
+        with open(data_file, "w") as f:
+            f.write("<articles></articles>")
+
+        cache = FindingsCache(os.path.join(tmp_dir, "cache.sqlite"))
+        try:
+            cache.put(data_file, 100, FINDINGS)
+
+            with open(data_file, "w") as f:
+                f.write("<articles><article></article></articles>")
+
+            assert cache.get(data_file, 100) is None
+
+            # Missing files are never served from the cache
+            os.remove(data_file)
+            assert cache.get(data_file, 100) is None
+        finally:
+            cache.close()
+
+def test_failed_scan_is_not_cached(monkeypatch):
+    """Test that a scan with a failed article chunk is not stored in the cache."""
+    from concurrent.futures import ThreadPoolExecutor
+    from synapse_miner import core
+    
+    def failing_chunk(articles, context_size):
+        raise RuntimeError("worker crashed")
+    
+    # Run the pool in-process so the patched chunk function is used
+    monkeypatch.setattr(core, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(core, "process_article_chunk", failing_chunk)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_file = os.path.join(tmp_dir, "articles.xml")
+        with open(data_file, "wb") as f:
+            f.write(b'<articles><article article-type="research-article">'
+                    b'<p>Data at syn1234567</p></article></articles>')
+        
+        miner = core.SynapseMiner(max_workers=1, cache_path=os.path.join(tmp_dir, "cache.sqlite"))
+        try:
+            assert miner.process_file(data_file) == []
+            assert miner.cache.get(data_file, miner.context_size) is None
+        finally:
+            miner.cache.close()
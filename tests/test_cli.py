@@ -0,0 +1,76 @@
+"""
+Tests for the command-line interface helpers.
+"""
+
+import os
+import argparse
+import tempfile
+import pytest
+from synapse_miner.cli import _batch_sort_key, _iter_batch_files, _positive_int
+
+def test_batch_files_sorted_by_numeric_pmc_id():
+    """Test that batch files are ordered by PMC number, not lexically."""
+    batch_files = [
+        "results.csv.PMC10000001_PMC10010000.xml.gz.csv",
+        "results.csv.notes.csv",
+        "results.csv.PMC9990001_PMC10000000.xml.gz.csv",
+        "results.csv.PMC100001_PMC110000.xml.gz.csv",
+    ]
+
+    assert sorted(batch_files, key=_batch_sort_key) == [
+        "results.csv.PMC100001_PMC110000.xml.gz.csv",
+        "results.csv.PMC9990001_PMC10000000.xml.gz.csv",
+        "results.csv.PMC10000001_PMC10010000.xml.gz.csv",
+        # Files without a PMC range go last
+        "results.csv.notes.csv",
+    ]
+
+def test_batch_sort_key_mixed_widths_and_prefixes():
+    """Test ordering when PMC and non-PMC names have IDs of different widths."""
+    batch_files = [
+        "results.csv.batch10.csv",
+        "results.csv.PMC10_PMC19.xml.gz.csv",
+        "results.csv.batch9.csv",
+        "results.csv.PMC9_PMC9.xml.gz.csv",
+        "results.csv.PMC100_PMC199.xml.gz.csv",
+    ]
+
+    assert sorted(batch_files, key=_batch_sort_key) == [
+        "results.csv.PMC9_PMC9.xml.gz.csv",
+        "results.csv.PMC10_PMC19.xml.gz.csv",
+        "results.csv.PMC100_PMC199.xml.gz.csv",
+        # Names without a PMC range keep a plain lexical order after them
+        "results.csv.batch10.csv",
+        "results.csv.batch9.csv",
+    ]
+
+def test_iter_batch_files_matches_prefix_and_suffix():
+    """Test that only '{output}.*.csv' files in the output directory are found."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        names = [
+            "results.csv.PMC1_PMC2.xml.gz.csv",
+            "results.csv.PMC3_PMC4.xml.gz.csv",
+            "results.csv",          # the combined output itself
+            "results.csv.csv",      # no batch name between the dots
+            "results.csv.PMC5_PMC6.xml.gz",
+            "other.csv.PMC1_PMC2.xml.gz.csv",
+        ]
+        for name in names:
+            with open(os.path.join(tmp_dir, name), "w") as f:
+                f.write("pmcid,synid,context\n")
+
+        found = _iter_batch_files(os.path.join(tmp_dir, "results.csv"))
+
+        assert sorted(os.path.basename(path) for path in found) == [
+            "results.csv.PMC1_PMC2.xml.gz.csv",
+            "results.csv.PMC3_PMC4.xml.gz.csv",
+        ]
+
+def test_positive_int():
+    """Test that option values below 1 or non-integers are rejected."""
+    assert _positive_int("1") == 1
+    assert _positive_int("8") == 8
+
+    for value in ("0", "-1", "abc", "1.5"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            _positive_int(value)
@@ -0,0 +1,77 @@
+"""
+Tests for combining batch result files.
+"""
+
+import os
+import csv
+import tempfile
+from synapse_miner.utils.data_utils import combine_results
+
+def _write_batch(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["pmcid", "synid", "context"])
+        writer.writerows(rows)
+
+def test_combine_results_deduplicates_and_tags_source():
+    """Test that batch files are combined with duplicates removed."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write_batch(os.path.join(tmp_dir, "results.csv.PMC1_PMC2.xml.gz.csv"), [
+            ("pmc:PMC1", "syn1234567", "data at syn1234567, see methods"),
+        ])
+        _write_batch(os.path.join(tmp_dir, "results.csv.PMC3_PMC4.xml.gz.csv"), [
+            ("pmc:PMC1", "syn1234567", "data at syn1234567, see methods"),
+            ("pmc:PMC3", "syn7654321", "deposited in syn7654321"),
+        ])
+        output_path = os.path.join(tmp_dir, "combined.csv")
+
+        assert combine_results(output_path, directory=tmp_dir) == output_path
+
+        with open(output_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+
+        assert [(row["synid"], row["source_file"]) for row in rows] == [
+            ("syn1234567", "PMC1_PMC2.xml.gz"),
+            ("syn7654321", "PMC3_PMC4.xml.gz"),
+        ]
+        assert rows[0]["context"] == "data at syn1234567, see methods"
+
+def test_combine_results_no_files():
+    """Test that combining with no matching files returns None."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        assert combine_results(os.path.join(tmp_dir, "combined.csv"), directory=tmp_dir) is None
+
+def test_combine_results_source_file_with_dotted_output_name():
+    """Test that source_file is correct for output names with extra dots."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write_batch(os.path.join(tmp_dir, "weekly.run.csv.PMC1_PMC2.xml.gz.csv"), [
+            ("pmc:PMC1", "syn1234567", "data at syn1234567"),
+        ])
+        output_path = os.path.join(tmp_dir, "combined.csv")
+
+        assert combine_results(output_path, directory=tmp_dir, pattern="weekly.run.csv.*.csv") == output_path
+
+        with open(output_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+
+        assert [row["source_file"] for row in rows] == ["PMC1_PMC2.xml.gz"]
+
+def test_combine_results_skips_files_that_fail_partway():
+    """Test that a file failing partway through contributes no rows."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write_batch(os.path.join(tmp_dir, "results.csv.PMC1_PMC2.xml.gz.csv"), [
+            ("pmc:PMC1", "syn1234567", "data at syn1234567"),
+        ])
+        # A field over the csv module's size limit fails after the first row
+        _write_batch(os.path.join(tmp_dir, "results.csv.PMC3_PMC4.xml.gz.csv"), [
+            ("pmc:PMC3", "syn7654321", "deposited in syn7654321"),
+            ("pmc:PMC4", "syn1111111", "x" * (csv.field_size_limit() + 1)),
+        ])
+        output_path = os.path.join(tmp_dir, "combined.csv")
+
+        assert combine_results(output_path, directory=tmp_dir) == output_path
+
+        with open(output_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+
+        assert [row["synid"] for row in rows] == ["syn1234567"]
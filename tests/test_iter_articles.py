@@ -0,0 +1,37 @@
+"""
+Tests for splitting article XML streams into individual articles.
+"""
+
+import os
+import gzip
+import tempfile
+from synapse_miner.core import SynapseMiner
+
+# Articles with attributes, text between them, a tag that must not match
+# ('<article>' without attributes) and a trailing unterminated article
+ARTICLES_XML = b'''<?xml version="1.0"?>
+<articles>
+<article article-type="research-article"><p>First syn1234567</p></article>
+between articles
+<article>no attributes, skipped</article>
+<article dtd-version="1.0"><p>Second</p><p>spans several chunks</p></article><article xml:lang="en"><p>Adjacent</p></article>
+<article article-type="review"><p>Unterminated
+</articles>'''
+
+def test_gzip_scanner_matches_mmap_scanner():
+    """Test that gzipped input yields the same articles at any chunk size."""
+    miner = SynapseMiner(max_workers=1)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        xml_path = os.path.join(tmp_dir, "articles.xml")
+        gz_path = os.path.join(tmp_dir, "articles.xml.gz")
+        with open(xml_path, "wb") as f:
+            f.write(ARTICLES_XML)
+        with gzip.open(gz_path, "wb") as f:
+            f.write(ARTICLES_XML)
+
+        expected = list(miner._iter_articles_mmap(xml_path))
+        assert len(expected) == 3
+
+        # Chunk sizes around len(b'<article ') split the start tag
+        for chunk_size in (1, 9, 10, 11, 64, 1024 * 1024):
+            assert list(miner._iter_articles(gz_path, True, chunk_size=chunk_size)) == expected
@@ -0,0 +1,34 @@
+"""
+Tests for per-article Synapse ID extraction.
+"""
+
+from synapse_miner.core import process_article
+
+ARTICLE_XML = b'''<article article-type="research-article">
+    <front>
+        <article-meta>
+            <article-id pub-id-type="pmc">PMC7654321</article-id>
+            <title-group>
+                <article-title>Repeated Dataset Mentions</article-title>
+            </title-group>
+        </article-meta>
+    </front>
+    <body>
+        <p>Raw data are deposited in Synapse (syn1234567).</p>
+        <p>Processed data are also available from syn1234567 and syn7654321.</p>
+    </body>
+</article>'''
+
+def test_process_article_reports_each_id_once():
+    """Test that repeated mentions of a Synapse ID yield a single finding."""
+    pmc_id, findings = process_article(ARTICLE_XML, context_size=25)
+
+    assert pmc_id == "PMC7654321"
+    assert [finding["synid"] for finding in findings] == ["syn1234567", "syn7654321"]
+    # The first mention's context is kept
+    assert "deposited in Synapse" in findings[0]["context"]
+
+def test_process_article_skips_articles_without_ids():
+    """Test that articles without 'syn' followed by a digit yield nothing."""
+    xml = ARTICLE_XML.replace(b"syn1234567", b"synthesis").replace(b"syn7654321", b"synapse")
+    assert process_article(xml, context_size=25) == (None, [])